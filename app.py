@@ -1,18 +1,43 @@
 # app.py — SNSPD Performance Sandbox (with presets)
 import numpy as np
+import pandas as pd
 import streamlit as st
-import matplotlib.pyplot as plt
-
-from models import (
-    kinetic_inductance_nH,
-    ide_internal,
-    sde_system,
-    dcr_hz,
-    pulse_waveform,
-    jitter_fwhm_ps,
-    latching_risk,
-    const,
-)
+
+import models
+from models import const
+
+# ------------------ Cached model wrappers ------------------
+# Streamlit reruns the whole script on every widget change; memoize the pure model
+# functions by argument so untouched quantities become cache lookups.
+@st.cache_data(max_entries=128)
+def kinetic_inductance_nH(length_um, width_nm, thickness_nm):
+    return models.kinetic_inductance_nH(length_um, width_nm, thickness_nm)
+
+@st.cache_data(max_entries=128)
+def ide_internal(ib_over_ic, wavelength_nm, width_nm):
+    return models.ide_internal(ib_over_ic, wavelength_nm, width_nm)
+
+@st.cache_data(max_entries=128)
+def ide_sweep(wavelength_nm, width_nm):
+    return models.ide_sweep(wavelength_nm, width_nm)
+
+@st.cache_data(max_entries=128)
+def dcr_hz(ib_over_ic, T_K, wavelength_nm):
+    return models.dcr_hz(ib_over_ic, T_K, wavelength_nm)
+
+@st.cache_data(max_entries=128)
+def pulse_waveform(ib_over_ic, rload_ohm, lk_nH, _out):
+    # The time grid is fixed (PULSE_T_NS) and _out is unhashed, so neither is part
+    # of the cache key; cache_data stores its own copy of the result
+    return models.pulse_waveform(models.PULSE_T_NS, ib_over_ic, rload_ohm, lk_nH, out=_out)
+
+@st.cache_data(max_entries=128)
+def jitter_fwhm_ps(v_peak):
+    return models.jitter_fwhm_ps(v_peak)
+
+@st.cache_data(max_entries=128)
+def latching_risk(ib_over_ic, rload_ohm, lk_nH):
+    return models.latching_risk(ib_over_ic, rload_ohm, lk_nH)
 
 # ------------------ Page header ------------------
 st.set_page_config(page_title="SNSPD Performance Sandbox", layout="wide")
@@ -29,51 +54,26 @@ KEYS = [
     "width_nm", "thickness_nm", "fill_factor", "length_um", "rload_ohm",
 ]
 
-PRESETS = {
-    "Match-our-spec": {
-        # Goal: high SDE @ 1550 nm (NbTiN ~90 nm, Lk~353 nH, 50 Ω)
-        "ib_over_ic": 1.02,
-        "lambda_nm": 1550.0,
-        "temp_K": 4.0,
-        "absorption": 0.97,
-        "coupling": 1.00,
-        "width_nm": 90.0,
-        "thickness_nm": 7.0,
-        "fill_factor": 0.50,
-        "length_um": 7413.0,   # -> ~353 nH in this toy model
-        "rload_ohm": 50.0,
-    },
-    "High-throughput (faster reset)": {
-        # Goal: shorter tau for count-rate talking point
-        "ib_over_ic": 0.95,
-        "lambda_nm": 1550.0,
-        "temp_K": 4.0,
-        "absorption": 0.90,
-        "coupling": 0.95,
-        "width_nm": 90.0,
-        "thickness_nm": 7.0,
-        "fill_factor": 0.50,
-        "length_um": 5000.0,   # -> ~238 nH
-        "rload_ohm": 100.0,
-    },
-    "Low-noise demo": {
-        # Goal: show DCR reduction (cooler + shorter λ) with some SDE trade
-        "ib_over_ic": 0.86,
-        "lambda_nm": 800.0,
-        "temp_K": 2.0,
-        "absorption": 0.97,
-        "coupling": 0.95,
-        "width_nm": 90.0,
-        "thickness_nm": 7.0,
-        "fill_factor": 0.50,
-        "length_um": 7413.0,   # same geometry as spec
-        "rload_ohm": 50.0,
-    },
+# Preset values, one row per preset, in KEYS order:
+#   ib_over_ic, lambda_nm, temp_K, absorption, coupling,
+#   width_nm, thickness_nm, fill_factor, length_um, rload_ohm
+PRESET_VALUES = {
+    # Goal: high SDE @ 1550 nm (NbTiN ~90 nm, Lk~353 nH, 50 Ω); length -> ~353 nH in this toy model
+    "Match-our-spec": np.array(
+        [1.02, 1550.0, 4.0, 0.97, 1.00, 90.0, 7.0, 0.50, 7413.0, 50.0], dtype=np.float64
+    ),
+    # Goal: shorter tau for count-rate talking point; length -> ~238 nH
+    "High-throughput (faster reset)": np.array(
+        [0.95, 1550.0, 4.0, 0.90, 0.95, 90.0, 7.0, 0.50, 5000.0, 100.0], dtype=np.float64
+    ),
+    # Goal: show DCR reduction (cooler + shorter λ) with some SDE trade; same geometry as spec
+    "Low-noise demo": np.array(
+        [0.86, 800.0, 2.0, 0.97, 0.95, 90.0, 7.0, 0.50, 7413.0, 50.0], dtype=np.float64
+    ),
 }
 
-def apply_preset(values: dict, label: str):
-    for k, v in values.items():
-        st.session_state[k] = v
+def apply_preset(name: str, label: str):
+    st.session_state.update({k: float(v) for k, v in zip(KEYS, PRESET_VALUES[name])})
     st.session_state["_last_preset"] = label
     st.toast(f"Preset applied: {label}", icon="✅")
     st.rerun()
@@ -82,11 +82,11 @@ def preset_bar():
     st.subheader("One-click presets")
     c1, c2, c3 = st.columns(3)
     if c1.button("Match-our-spec", use_container_width=True):
-        apply_preset(PRESETS["Match-our-spec"], "Match-our-spec")
+        apply_preset("Match-our-spec", "Match-our-spec")
     if c2.button("High-throughput (faster reset)", use_container_width=True):
-        apply_preset(PRESETS["High-throughput (faster reset)"], "High-throughput")
+        apply_preset("High-throughput (faster reset)", "High-throughput")
     if c3.button("Low-noise demo", use_container_width=True):
-        apply_preset(PRESETS["Low-noise demo"], "Low-noise demo")
+        apply_preset("Low-noise demo", "Low-noise demo")
 
 preset_bar()
 
@@ -123,18 +123,17 @@ fill = float(st.session_state["fill_factor"])
 length = float(st.session_state["length_um"])
 rload = float(st.session_state["rload_ohm"])
 
-# If the model reads a global coupling, update it (kept from your original)
-const.COUPLING = coupling
-
 # ------------------ Model evaluations ------------------
 lk_nH = kinetic_inductance_nH(length, width, thickness)
 ide = ide_internal(ib_over_ic, wavelength, width)
-sde = sde_system(ide, absorption)
+sde = models.sde_system(ide, absorption, coupling)
 dcr = dcr_hz(ib_over_ic, T, wavelength)
 
-# Pulse grid & derived timing
-t_ns = np.linspace(0, 20.0, 1000)
-v, tau_ns, v_peak = pulse_waveform(t_ns, ib_over_ic, rload, lk_nH)
+# Pulse & derived timing
+# One output buffer per session, reused across reruns
+if "_pulse_buf" not in st.session_state:
+    st.session_state["_pulse_buf"] = np.empty_like(models.PULSE_T_NS)
+v, tau_ns, v_peak = pulse_waveform(ib_over_ic, rload, lk_nH, st.session_state["_pulse_buf"])
 jitter_ps = jitter_fwhm_ps(v_peak)
 risk_score, risk_level = latching_risk(ib_over_ic, rload, lk_nH)
 
@@ -148,15 +147,15 @@ with col1:
     m2.metric("SDE (system)", f"{sde*100:.1f}%")
     m3.metric("DCR", f"{dcr:.1f} Hz")
 
-    fig1, ax1 = plt.subplots()
-    xs = np.linspace(0.5, 1.10, 120)
-    ax1.plot(xs, [ide_internal(x, wavelength, width) for x in xs], label="IDE vs Ib/Ic")
-    ax1.plot(xs, [sde_system(ide_internal(x, wavelength, width), absorption) for x in xs], label="SDE vs Ib/Ic")
-    ax1.set_xlabel("Ib/Ic")
-    ax1.set_ylabel("Efficiency")
-    ax1.set_ylim(0, 1.05)
-    ax1.legend()
-    st.pyplot(fig1)
+    # Sweep is memoized on (wavelength, width) only, so bias/absorption/coupling
+    # drags hit the cache; SDE is just a scale of it
+    xs, ide_curve = ide_sweep(wavelength, width)
+    sde_curve = models.sde_system(ide_curve, absorption, coupling)
+    st.line_chart(
+        pd.DataFrame({"IDE": ide_curve, "SDE": sde_curve}, index=xs),
+        x_label="Ib/Ic",
+        y_label="Efficiency",
+    )
 
 with col2:
     st.subheader("Pulse & Timing")
@@ -165,11 +164,11 @@ with col2:
     m5.metric("Decay constant τ", f"{tau_ns:.2f} ns")
     m6.metric("Jitter (FWHM)", f"{jitter_ps:.1f} ps")
 
-    fig2, ax2 = plt.subplots()
-    ax2.plot(t_ns, v)
-    ax2.set_xlabel("Time (ns)")
-    ax2.set_ylabel("Pulse (arb. units)")
-    st.pyplot(fig2)
+    st.line_chart(
+        pd.DataFrame({"Pulse": v}, index=models.PULSE_T_NS),
+        x_label="Time (ns)",
+        y_label="Pulse (arb. units)",
+    )
 
 st.divider()
 st.subheader("Latching Heuristic")
@@ -4,9 +4,12 @@ The goal: produce realistic-looking trends with simple equations and tunable con
 """
 
 from dataclasses import dataclass
+import math
+
 import numpy as np
+from numba import njit, vectorize
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Constants:
     # Kinetic inductance constant to land Lk in ~10^2 nH range for realistic geometries.
     # Lk_nH ≈ K_LK * length_um / (width_nm * thickness_nm)
@@ -60,82 +63,146 @@ def kinetic_inductance_nH(length_um: float, width_nm: float, thickness_nm: float
     return float(lk)
 
 
+@njit(cache=True, fastmath=True)
+def _ide_center(lam, w, base, ls, ws):
+    # Shift center around base using wavelength and width
+    center = base + ls * (lam - 1550.0) / 500.0 + ws * (100.0 - w) / 50.0
+    return min(0.98, max(0.7, center))
+
+
+@vectorize(["float64(float64, float64, float64, float64, float64, float64, float64)"], cache=True, fastmath=True)
+def _ide_kernel(ib, lam, w, steep, base, ls, ws):
+    ib = min(1.1, max(0.0, ib))
+    center = _ide_center(lam, w, base, ls, ws)
+    ide = 1.0 / (1.0 + math.exp(-steep * (ib - center)))
+    return min(1.0, max(0.0, ide))
+
+
 def ide_internal(ib_over_ic: float, wavelength_nm: float, width_nm: float, c: Constants = const) -> float:
     """
     Internal detection efficiency as a logistic vs normalized bias.
     The logistic "center" shifts with wavelength and width (narrower wires help long-λ).
+    Accepts a scalar or an ndarray of biases (evaluated element-wise).
     """
-    ib = clamp(ib_over_ic, 0.0, 1.1)
-    # Shift center around base using wavelength and width
-    dlam = (wavelength_nm - 1550.0) / 500.0
-    dw = (100.0 - width_nm) / 50.0
-    center = c.IDE_CENTER_BASE + c.IDE_CENTER_LAMBDA_SENS * dlam + c.IDE_CENTER_WIDTH_SENS * dw
-    center = float(np.clip(center, 0.7, 0.98))
-    x = c.IDE_STEEPNESS * (ib - center)
-    ide = 1.0 / (1.0 + np.exp(-x))
-    return float(np.clip(ide, 0.0, 1.0))
+    steep, base, ls, ws = c.IDE_STEEPNESS, c.IDE_CENTER_BASE, c.IDE_CENTER_LAMBDA_SENS, c.IDE_CENTER_WIDTH_SENS
+    return _ide_kernel(ib_over_ic, wavelength_nm, width_nm, steep, base, ls, ws)
+
+
+# Canonical Ib/Ic grid for IDE sweeps, with the logistic precomputed over a grid of
+# centers (for the module-level const) so a sweep is a blend of two table rows.
+IDE_SWEEP_XS = np.linspace(0.5, 1.10, 120)
+_IDE_CENTERS = np.linspace(0.7, 0.98, 64)
+_IDE_LUT = 1.0 / (1.0 + np.exp(-const.IDE_STEEPNESS * (IDE_SWEEP_XS[None, :] - _IDE_CENTERS[:, None])))
+
+
+def ide_sweep(wavelength_nm: float, width_nm: float, c: Constants = const):
+    """
+    IDE over IDE_SWEEP_XS, interpolated between precomputed logistic rows.
+    Returns (xs, ide_curve).
+    """
+    if c is not const:
+        return IDE_SWEEP_XS, ide_internal(IDE_SWEEP_XS, wavelength_nm, width_nm, c)
+    base, ls, ws = c.IDE_CENTER_BASE, c.IDE_CENTER_LAMBDA_SENS, c.IDE_CENTER_WIDTH_SENS
+    center = _ide_center(float(wavelength_nm), float(width_nm), base, ls, ws)
+    idx = min(max(int(np.searchsorted(_IDE_CENTERS, center)), 1), _IDE_CENTERS.size - 1)
+    lo, hi = _IDE_CENTERS[idx - 1], _IDE_CENTERS[idx]
+    frac = (center - lo) / (hi - lo)
+    return IDE_SWEEP_XS, (1.0 - frac) * _IDE_LUT[idx - 1] + frac * _IDE_LUT[idx]
+
 
+def sde_system(ide: float, absorption: float, coupling: float = None, c: Constants = const) -> float:
+    """
+    System detection efficiency SDE = absorption × coupling × IDE (element-wise for ndarray IDE).
+    coupling defaults to c.COUPLING.
+    """
+    coupling = c.COUPLING if coupling is None else coupling
+    ide = np.clip(ide, 0.0, 1.0)
+    absorption = clamp(absorption, 0.0, 1.0)
+    sde = absorption * coupling * ide
+    return np.clip(sde, 0.0, 1.0)
 
-def sde_system(ide: float, absorption: float, c: Constants = const) -> float:
-    """System detection efficiency SDE = absorption × coupling × IDE."""
-    ide = float(np.clip(ide, 0.0, 1.0))
-    absorption = float(np.clip(absorption, 0.0, 1.0))
-    sde = absorption * c.COUPLING * ide
-    return float(np.clip(sde, 0.0, 1.0))
+
+@njit(cache=True, fastmath=True)
+def _dcr_kernel(ib, T, lam, base_hz, bias_gain, e_over_k, bb_base):
+    ib = min(1.1, max(0.0, ib))
+    T = max(0.5, T)
+    bias_term = math.exp(bias_gain * (ib - 0.8))
+    arrhenius = math.exp(-e_over_k / T)
+    bb = bb_base * (lam / 1550.0) ** 2
+    return max(0.0, base_hz * bias_term * arrhenius + bb)
 
 
 def dcr_hz(ib_over_ic: float, T_K: float, wavelength_nm: float, c: Constants = const) -> float:
     """Dark-count rate: Arrhenius-like × bias gain + blackbody floor (very rough)."""
-    ib = clamp(ib_over_ic, 0.0, 1.1)
-    T = max(0.5, float(T_K))
-    bias_term = np.exp(c.DCR_BIAS_GAIN * (ib - 0.8))
-    arrhenius = np.exp(-c.DCR_E_OVER_K / T)
-    bb = c.DCR_BB_BASE * (wavelength_nm / 1550.0) ** 2
-    dcr = c.DCR_BASE_HZ * bias_term * arrhenius + bb
-    return float(max(0.0, dcr))
+    base_hz, bias_gain, e_over_k, bb_base = c.DCR_BASE_HZ, c.DCR_BIAS_GAIN, c.DCR_E_OVER_K, c.DCR_BB_BASE
+    return _dcr_kernel(float(ib_over_ic), float(T_K), float(wavelength_nm), base_hz, bias_gain, e_over_k, bb_base)
+
+
+@njit(cache=True, fastmath=True)
+def _pulse_kernel(t, v_peak, inv_tr, inv_tau, out):
+    # Fused rise × decay in one pass, no intermediate arrays; expm1 keeps the
+    # rise accurate near t = 0
+    for i in range(t.size):
+        x = t[i] if t[i] > 0.0 else 0.0
+        out[i] = v_peak * (-math.expm1(-x * inv_tr)) * math.exp(-x * inv_tau)
+    return out
+
+
+# Default pulse time grid (ns); fixed size, so built once and shared across calls
+PULSE_T_NS = np.linspace(0, 20.0, 1000)
 
 
-def pulse_waveform(t_ns: np.ndarray, ib_over_ic: float, rload_ohm: float, lk_nH: float, c: Constants = const):
+def pulse_waveform(t_ns: np.ndarray, ib_over_ic: float, rload_ohm: float, lk_nH: float, c: Constants = const,
+                   out: np.ndarray = None):
     """
     Simple SNSPD voltage pulse (arb. units): fast rise, exponential decay with tau = Lk / R.
+    Pass out (same shape as t_ns) to write the waveform into a reusable buffer.
     """
+    jitter_rise_ps, amp_scale = c.JITTER_RISE_PS, c.AMP_SCALE
     lk_H = max(1e-12, lk_nH * 1e-9)
     R = max(1.0, rload_ohm)
     tau_ns = (lk_H / R) * 1e9  # ns
     # Peak amplitude scales with ib_over_ic (bounded) and arbitrarily with c.AMP_SCALE
-    ib = float(np.clip(ib_over_ic, 0.0, 1.1))
-    v_peak = c.AMP_SCALE * (0.5 + 0.5 * ib)
+    ib = clamp(ib_over_ic, 0.0, 1.1)
+    v_peak = amp_scale * (0.5 + 0.5 * ib)
 
     # Approximate rise with a 1 - exp(-t/tr) with tr = JITTER_RISE_PS/1000 ns, then decay exp(-t/tau)
-    tr_ns = c.JITTER_RISE_PS / 1000.0
-    rise = 1.0 - np.exp(-np.maximum(0, t_ns) / max(1e-3, tr_ns))
-    decay = np.exp(-np.maximum(0, t_ns) / max(1e-3, tau_ns))
-    v = v_peak * rise * decay
+    tr_ns = jitter_rise_ps / 1000.0
+    t_ns = np.asarray(t_ns, dtype=np.float64)
+    inv_tr = 1.0 / max(1e-3, tr_ns)
+    inv_tau = 1.0 / max(1e-3, tau_ns)
+    if out is None:
+        out = np.empty_like(t_ns)
+    v = _pulse_kernel(t_ns, v_peak, inv_tr, inv_tau, out)
     return v, tau_ns, v_peak
 
 
+@njit(cache=True, fastmath=True)
+def _jitter_kernel(v_peak, tr_ps, noise_coeff, base_ps):
+    # Avoid div by zero
+    jitter_amp = noise_coeff * (tr_ps ** 2) / max(1e-6, v_peak)
+    return math.sqrt(jitter_amp ** 2 + base_ps ** 2)
+
+
 def jitter_fwhm_ps(v_peak: float, c: Constants = const) -> float:
     """
     Combine amplitude/slope-limited jitter with a baseline:
     jitter_amp_ps ~ C * tr / slope ≈ C * tr / (V_peak / tr) = C * tr^2 / V_peak  (phenomenological)
     """
-    tr_ps = c.JITTER_RISE_PS
-    # Avoid div by zero
-    jitter_amp = c.JITTER_NOISE_COEFF * (tr_ps ** 2) / max(1e-6, v_peak)
-    total = np.sqrt(jitter_amp ** 2 + c.JITTER_BASE_PS ** 2)
-    return float(total)
+    tr_ps, noise_coeff, base_ps = c.JITTER_RISE_PS, c.JITTER_NOISE_COEFF, c.JITTER_BASE_PS
+    return _jitter_kernel(float(v_peak), tr_ps, noise_coeff, base_ps)
+
+
+LATCH_LEVELS = np.array(["Low", "Moderate", "High"])
 
 
 def latching_risk(ib_over_ic: float, rload_ohm: float, lk_nH: float, c: Constants = const):
     """
     Heuristic: higher bias, lower Lk, lower Rload can raise risk of latching.
     score = (Ib/Ic) * (Rload / 50) * (100 / Lk[nH])
+    Level is Low below 1, Moderate below LATCH_THRESH, else High (element-wise for ndarray inputs).
     """
-    score = float(np.clip(ib_over_ic, 0.0, 1.2)) * (rload_ohm / c.LATCH_REF_RLOAD) * (c.LATCH_SCALE_LK_NH / max(1e-3, lk_nH))
-    if score < 1.0:
-        level = "Low"
-    elif score < c.LATCH_THRESH:
-        level = "Moderate"
-    else:
-        level = "High"
+    ref_rload, scale_lk, thresh = c.LATCH_REF_RLOAD, c.LATCH_SCALE_LK_NH, c.LATCH_THRESH
+    score = np.clip(ib_over_ic, 0.0, 1.2) * (rload_ohm / ref_rload) * (scale_lk / np.maximum(1e-3, lk_nH))
+    level = LATCH_LEVELS[np.searchsorted(np.array([1.0, thresh]), score, side="right")]
     return score, level
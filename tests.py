@@ -2,15 +2,17 @@ import numpy as np
 from models import (
     kinetic_inductance_nH,
     ide_internal,
+    ide_sweep,
     sde_system,
     dcr_hz,
     pulse_waveform,
     jitter_fwhm_ps,
+    latching_risk,
+    PULSE_T_NS,
 )
 
-def approx_monotone_increasing(f, xs):
-    vals = [f(x) for x in xs]
-    return all(vals[i] <= vals[i+1] + 1e-9 for i in range(len(vals)-1))
+def approx_monotone_increasing(vals):
+    return bool((np.diff(np.asarray(vals)) >= -1e-9).all())
 
 def test_lk_scaling():
     lk1 = kinetic_inductance_nH(8000, 100, 7)
@@ -21,12 +23,18 @@ def test_lk_scaling():
 
 def test_ide_bias_monotonic():
     xs = np.linspace(0.6, 1.05, 20)
-    assert approx_monotone_increasing(lambda x: ide_internal(x, 1550, 100), xs)
+    assert approx_monotone_increasing(ide_internal(xs, 1550, 100))
+
+def test_ide_sweep_matches_direct():
+    for lam, w in [(800, 60), (1550, 100), (2200, 140)]:
+        xs, curve = ide_sweep(lam, w)
+        assert np.allclose(curve, ide_internal(xs, lam, w), atol=1e-3)
 
 def test_sde_bounds():
     ide = 0.8
     sde = sde_system(ide, 0.9)
     assert 0 <= sde <= 1.0
+    assert sde_system(ide, 0.9, 0.5) < sde
 
 def test_dcr_bias():
     low = dcr_hz(0.7, 2.0, 1550)
@@ -38,14 +46,25 @@ def test_pulse_and_jitter():
     t = np.linspace(0, 20.0, 1000)
     v, tau_ns, v_peak = pulse_waveform(t, 0.9, 50, 300)
     assert v.max() > 0
+    buf = np.empty_like(PULSE_T_NS)
+    v2, _, _ = pulse_waveform(PULSE_T_NS, 0.9, 50, 300, out=buf)
+    assert v2 is buf and np.allclose(v2, v)
     j = jitter_fwhm_ps(v_peak)
     assert j > 0
 
+def test_latching_levels():
+    _, levels = latching_risk(np.array([0.2, 0.9, 1.1]), 50, np.array([300, 50, 20]))
+    assert list(levels) == ["Low", "Moderate", "High"]
+    score, level = latching_risk(0.9, 50, 300)
+    assert level == "Low" and np.isclose(score, 0.3)
+
 if __name__ == "__main__":
     # Run the tests without pytest
     test_lk_scaling()
     test_ide_bias_monotonic()
+    test_ide_sweep_matches_direct()
     test_sde_bounds()
     test_dcr_bias()
     test_pulse_and_jitter()
+    test_latching_levels()
     print("All sanity tests passed.")